@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+HexStrike AI - Performance Benchmarks
+
+Standalone micro-benchmarks for the server's hot paths. They run in this
+process against the server module, never through the HTTP API.
+
+Usage: python3 hexstrike_benchmark.py <benchmark> [options]
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import importlib.util
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import hexstrike_server
+from hexstrike_server import (ERROR_SCAN_WINDOW, LAZY_OPTIONAL_MODULES, LOG_FORMAT, LOG_TEXT_FORMAT,
+                              SPAWN_USE_POSIX_SPAWN, EnhancedCommandExecutor, ErrorType, JSONLogFormatter,
+                              error_handler, split_command)
+
+def timing_summary(samples: List[float]) -> Dict[str, float]:
+    """Mean and percentiles (milliseconds) of a list of durations in seconds"""
+    ordered = sorted(samples)
+    return {
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000
+    }
+
+# ============================================================================
+# PROCESS SPAWN
+# ============================================================================
+
+def benchmark_process_spawn(command: str, iterations: int) -> Dict[str, Any]:
+    """Time spawning a command through /bin/sh versus direct argv exec (default and posix_spawn variants)"""
+    exec_target = split_command(command)
+    if exec_target is None:
+        raise ValueError("Command needs a shell or its executable was not found; use a plain command such as 'uname'")
+    executable, argv = exec_target
+
+    spawners = {
+        "shell": lambda: subprocess.Popen(command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+        "exec": lambda: subprocess.Popen(argv, executable=executable,
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+        "exec_posix_spawn": lambda: subprocess.Popen(argv, executable=executable, close_fds=False,
+                                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    }
+    timings = {mode: [] for mode in spawners}
+    cpu_seconds = {mode: 0.0 for mode in spawners}
+
+    # Alternate the paths so system noise affects them equally
+    for _ in range(iterations):
+        for mode, spawn in spawners.items():
+            before = os.times()
+            start = time.perf_counter()
+            spawn().wait()
+            timings[mode].append(time.perf_counter() - start)
+            after = os.times()
+            cpu_seconds[mode] += (after.user + after.system + after.children_user + after.children_system -
+                                  before.user - before.system - before.children_user - before.children_system)
+
+    results = {}
+    for mode, samples in timings.items():
+        results[mode] = timing_summary(samples)
+        results[mode]["cpu_ms_per_spawn"] = cpu_seconds[mode] / iterations * 1000
+        results[mode]["spawns_per_second"] = len(samples) / sum(samples)
+
+    return {
+        "command": command,
+        "argv": argv,
+        "executable": executable,
+        "iterations": iterations,
+        "posix_spawn_available": getattr(subprocess, "_USE_POSIX_SPAWN", False),
+        "executor_mode": "exec_posix_spawn" if SPAWN_USE_POSIX_SPAWN else "exec",
+        "results": results,
+        "speedup": {
+            mode: results["shell"]["mean_ms"] / results[mode]["mean_ms"]
+            for mode in ("exec", "exec_posix_spawn") if results[mode]["mean_ms"]
+        }
+    }
+
+def run_spawn(args) -> Dict[str, Any]:
+    return benchmark_process_spawn(args.command, args.iterations)
+
+# ============================================================================
+# LOG FORMATTING
+# ============================================================================
+
+def measure_log_formatting(iterations: int) -> Dict[str, Any]:
+    """CPU cost of the per-command log output in text and JSON mode, written to an in-memory sink"""
+    executor = EnhancedCommandExecutor("nmap -sCV -p 1-1000 -T4 -Pn 10.0.0.1")
+    executor.pid = 4242
+    executor.spawn_mode = "exec"
+    executor.return_code = 0
+    executor.start_time, executor.end_time = 0.0, 12.5
+    executor.stdout_buffer.write("PORT   STATE SERVICE\n" * 64)
+
+    results = {}
+    for log_format, formatter in (("text", logging.Formatter(LOG_TEXT_FORMAT)), ("json", JSONLogFormatter())):
+        sink = io.StringIO()
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(formatter)
+        bench_logger = logging.Logger(f"hexstrike.log_benchmark.{log_format}")
+        bench_logger.addHandler(handler)
+        visual = log_format == "text"
+
+        start = time.thread_time()
+        for _ in range(iterations):
+            executor._log_started(log=bench_logger, visual=visual)
+            executor._log_summary(True, log=bench_logger, visual=visual)
+        cpu_seconds = time.thread_time() - start
+
+        results[log_format] = {
+            "cpu_us_per_request": cpu_seconds / iterations * 1e6,
+            "bytes_per_request": len(sink.getvalue()) / iterations
+        }
+
+    executor.stdout_buffer.close()
+    text_cpu = results["text"]["cpu_us_per_request"]
+    return {
+        "iterations": iterations,
+        "results": results,
+        "cpu_reduction_percent": (1 - results["json"]["cpu_us_per_request"] / text_cpu) * 100 if text_cpu else None,
+        "active_format": LOG_FORMAT
+    }
+
+def run_log_formatting(args) -> Dict[str, Any]:
+    return measure_log_formatting(args.iterations)
+
+# ============================================================================
+# ERROR CLASSIFICATION
+# ============================================================================
+
+def benchmark_error_classification(size_bytes: int, iterations: int) -> Dict[str, Any]:
+    """Time per-pattern classification of a whole output against the one-pass tail matcher"""
+    line = "Discovered open port 8443/tcp on 10.0.13.37 | http-title: Admin Console\n"
+    body = line * max(1, size_bytes // len(line))
+    samples = {
+        "error_at_end": body + "Error: connection refused by remote host\n",
+        "no_error": body
+    }
+
+    def per_pattern(text: str) -> ErrorType:
+        text = text.lower()
+        for pattern, error_type in error_handler.error_patterns.items():
+            if re.search(pattern, text, re.IGNORECASE):
+                return error_type
+        return ErrorType.UNKNOWN
+
+    results = {}
+    for name, text in samples.items():
+        timings = {}
+        for method, classify in (("per_pattern", per_pattern), ("one_pass", error_handler.classify_error)):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                error_type = classify(text)
+            timings[method] = {"ms_per_call": (time.perf_counter() - start) / iterations * 1000,
+                               "error_type": error_type.value}
+        results[name] = {
+            **timings,
+            "identical": timings["per_pattern"]["error_type"] == timings["one_pass"]["error_type"],
+            "speedup": timings["per_pattern"]["ms_per_call"] / max(timings["one_pass"]["ms_per_call"], 1e-9)
+        }
+
+    return {
+        "output_bytes": len(body),
+        "iterations": iterations,
+        "scan_window": ERROR_SCAN_WINDOW,
+        "results": results
+    }
+
+def run_error_classification(args) -> Dict[str, Any]:
+    return benchmark_error_classification(args.size_bytes, args.iterations)
+
+# ============================================================================
+# IMPORTS
+# ============================================================================
+
+def profile_imports(module_names: List[str], limit: int = 20) -> Dict[str, Any]:
+    """Run `python -X importtime` on the given modules in a child process and rank the slowest"""
+    script = "; ".join(f"import {name}" for name in module_names)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            capture_output=True, text=True, timeout=120)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000
+        })
+
+    top_level = {entry["module"]: entry["cumulative_ms"] for entry in entries if entry["depth"] == 0}
+    return {
+        "modules": {name: top_level.get(name) for name in module_names},
+        "errors": result.stderr.strip().splitlines()[-1] if result.returncode != 0 else None,
+        "slowest": sorted(entries, key=lambda entry: entry["self_ms"], reverse=True)[:limit]
+    }
+
+def run_imports(args) -> Dict[str, Any]:
+    names = [name for name in LAZY_OPTIONAL_MODULES if importlib.util.find_spec(name.split(".")[0]) is not None]
+    return profile_imports(names, args.limit)
+
+# ============================================================================
+# STARTUP
+# ============================================================================
+
+STARTUP_PROBE_SCRIPT = """
+import json, sys, threading, time
+start = time.perf_counter()
+import hexstrike_server
+cold_start = time.perf_counter() - start
+time.sleep(float(sys.argv[1]))
+import psutil
+print(json.dumps({"cold_start": cold_start, "threads": threading.active_count(),
+                  "rss_mb": psutil.Process().memory_info().rss / (1024 * 1024)}))
+"""
+
+def benchmark_startup(runs: int, settle_seconds: float) -> Dict[str, Any]:
+    """Import the server in fresh child processes with lazy and eager services and compare them
+
+    Children get a scratch data directory so their job store and cache never
+    touch a running server's state.
+    """
+    module_dir = os.path.dirname(os.path.abspath(hexstrike_server.__file__))
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="hexstrike_startup_") as scratch:
+        env = {
+            **os.environ,
+            "PYTHONPATH": module_dir + os.pathsep + os.environ.get("PYTHONPATH", ""),
+            "HEXSTRIKE_DATA_DIR": scratch,
+            "HEXSTRIKE_JOB_DB": os.path.join(scratch, "jobs.db"),
+            "HEXSTRIKE_CACHE_PATH": os.path.join(scratch, "cache.db"),
+            "HEXSTRIKE_COMMAND_LOG": ""
+        }
+        for mode, lazy in (("lazy", "1"), ("eager", "0")):
+            samples = []
+            for _ in range(runs):
+                probe = subprocess.run(
+                    [sys.executable, "-c", STARTUP_PROBE_SCRIPT, str(settle_seconds)],
+                    env={**env, "HEXSTRIKE_LAZY_SERVICES": lazy}, cwd=scratch,
+                    capture_output=True, text=True, timeout=120
+                )
+                if probe.returncode != 0:
+                    raise RuntimeError(f"Startup probe failed: {probe.stderr.strip().splitlines()[-1:]}")
+                samples.append(json.loads(probe.stdout.strip().splitlines()[-1]))
+
+            results[mode] = {
+                "cold_start": timing_summary([sample["cold_start"] for sample in samples]),
+                "idle_threads": max(sample["threads"] for sample in samples),
+                "idle_rss_mb": sum(sample["rss_mb"] for sample in samples) / len(samples)
+            }
+
+    return {
+        "runs": runs,
+        "settle_seconds": settle_seconds,
+        "results": results,
+        "cold_start_reduction_percent": (1 - results["lazy"]["cold_start"]["p50_ms"] / results["eager"]["cold_start"]["p50_ms"]) * 100
+    }
+
+def run_startup(args) -> Dict[str, Any]:
+    return benchmark_startup(args.runs, args.settle_seconds)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+BENCHMARKS: Dict[str, Callable] = {
+    "spawn": run_spawn,
+    "log-formatting": run_log_formatting,
+    "error-classification": run_error_classification,
+    "imports": run_imports,
+    "startup": run_startup,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run HexStrike AI performance benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    spawn = subparsers.add_parser("spawn", help="Shell versus shell-free process spawn latency and CPU")
+    spawn.add_argument("--command", default="uname",
+                       help="Plain external command to spawn; 'true' is a shell builtin (default: uname)")
+    spawn.add_argument("--iterations", type=int, default=100, help="Spawns per mode (default: 100)")
+
+    log_formatting = subparsers.add_parser("log-formatting", help="Per-command log formatting CPU, text versus JSON")
+    log_formatting.add_argument("--iterations", type=int, default=1000, help="Commands to log per format (default: 1000)")
+
+    classification = subparsers.add_parser("error-classification",
+                                           help="Per-pattern versus one-pass error classification of a large output")
+    classification.add_argument("--size-bytes", type=int, default=4 * 1024 * 1024,
+                                help="Size of the synthetic tool output (default: 4 MiB)")
+    classification.add_argument("--iterations", type=int, default=3, help="Classifications per method (default: 3)")
+
+    imports = subparsers.add_parser("imports", help="`python -X importtime` profile of the lazily loaded modules")
+    imports.add_argument("--limit", type=int, default=20, help="Slowest modules to list (default: 20)")
+
+    startup = subparsers.add_parser("startup", help="Cold start, idle threads and RSS with lazy versus eager services")
+    startup.add_argument("--runs", type=int, default=3, help="Fresh interpreter starts per mode (default: 3)")
+    startup.add_argument("--settle-seconds", type=float, default=1.0,
+                         help="Idle time before sampling threads and RSS (default: 1.0)")
+
+    args = parser.parse_args()
+    try:
+        report = BENCHMARKS[args.benchmark](args)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import os
+import sys
+import tempfile
+
+# hexstrike_server creates its stores under HEXSTRIKE_DATA_DIR at import time
+DATA_DIR = tempfile.mkdtemp(prefix="hexstrike-tests-")
+os.environ["HEXSTRIKE_DATA_DIR"] = DATA_DIR
+os.environ["HEXSTRIKE_JOB_DB"] = os.path.join(DATA_DIR, "jobs.db")
+os.environ["HEXSTRIKE_FINDINGS_DB"] = os.path.join(DATA_DIR, "findings.db")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hexstrike_server  # noqa: E402
+
+# The module rewraps sys.stdout/sys.stderr for UTF-8 logging. Keep the wrappers
+# alive so collecting them doesn't close the streams pytest captures into.
+WRAPPED_STREAMS = (sys.stdout, sys.stderr)
@@ -0,0 +1,247 @@
+import json
+import os
+import time
+
+import pytest
+
+import hexstrike_server as hs
+
+NMAP_TEXT = """Starting Nmap 7.94 ( https://nmap.org )
+Nmap scan report for web.example (10.0.0.1)
+Host is up (0.010s latency).
+PORT    STATE  SERVICE VERSION
+22/tcp  open   ssh     OpenSSH 8.9p1 Ubuntu
+| ssh-hostkey:
+|_  256 aa:bb (ED25519)
+80/tcp  open   http    nginx 1.18.0
+| http-vuln-test:
+|   VULNERABLE:
+|     State: VULNERABLE
+|_    IDs:  CVE:CVE-2099-0001
+443/tcp closed https
+MAC Address: 00:11:22:33:44:55 (Vendor)
+
+Host script results:
+|_clock-skew: mean: 0s
+
+Nmap done: 1 IP address (1 host up) scanned in 1.00 seconds
+"""
+
+NUCLEI_TEXT = (
+    "[INF] Current nuclei version: v3.1.0\n"
+    "[\x1b[92mCVE-2021-41773\x1b[0m] [http] [\x1b[91mhigh\x1b[0m] https://target.example/cgi-bin/\n"
+    "[tech-detect:nginx] [http] [info] https://target.example\n"
+    "[git-config] [http] [medium] https://target.example/.git/config [\"bare\"]\n"
+)
+
+
+def parse(tool, output):
+    return hs.parse_tool_output(tool, output)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return hs.FindingsStore(str(tmp_path / "findings.db"))
+
+
+@pytest.fixture
+def plain_store(tmp_path):
+    return hs.FindingsStore(str(tmp_path / "findings-like.db"), fts=False)
+
+
+# ---- text parsers and findings_from_parsed ----
+
+def test_nmap_text_output_becomes_host_port_and_vulnerability_findings():
+    parsed = parse("nmap", NMAP_TEXT)
+    assert parsed["format"] == "nmap-text"
+    assert parsed["summary"]["open_ports"] == 2
+    assert parsed["summary"]["vulnerabilities"] == 1
+
+    findings = hs.findings_from_parsed(parsed)
+    kinds = [finding["kind"] for finding in findings]
+    assert kinds == ["host", "port", "port", "port", "vulnerability"]
+
+    host = findings[0]
+    assert (host["host"], host["name"], host["state"]) == ("10.0.0.1", "web.example", "up")
+    assert host["detail"]["mac"] == "00:11:22:33:44:55"
+
+    ssh = findings[1]
+    assert (ssh["port"], ssh["protocol"], ssh["name"], ssh["state"]) == (22, "tcp", "ssh", "open")
+    assert ssh["detail"]["product"] == "OpenSSH 8.9p1 Ubuntu"
+
+    vulnerability = findings[-1]
+    assert (vulnerability["port"], vulnerability["name"], vulnerability["state"]) == (80, "http-vuln-test", "vulnerable")
+    assert "CVE-2099-0001" in vulnerability["detail"]["output"]
+
+
+def test_parse_tool_output_picks_the_structured_parser_for_xml():
+    xml = ('<?xml version="1.0"?>\n<nmaprun><host><status state="up"/><address addr="10.0.0.9" addrtype="ipv4"/>'
+           '<ports><port protocol="udp" portid="53"><state state="open"/><service name="domain"/></port></ports>'
+           '</host></nmaprun>\n')
+    parsed = parse("nmap", xml)
+
+    assert parsed["format"] == "nmap-xml"
+    assert [(f["kind"], f.get("port")) for f in hs.findings_from_parsed(parsed)] == [("host", None), ("port", 53)]
+
+
+def test_parse_tool_output_ignores_tools_without_parsers():
+    assert parse("gobuster", "/admin (Status: 301)\n") is None
+
+
+def test_nuclei_text_output_strips_colours_and_splits_matchers():
+    parsed = parse("nuclei", NUCLEI_TEXT)
+    findings = hs.findings_from_parsed(parsed)
+
+    assert parsed["skipped_lines"] == 1
+    assert [(f["name"], f["severity"]) for f in findings] == [
+        ("CVE-2021-41773", "high"), ("tech-detect", "info"), ("git-config", "medium")]
+    assert findings[0]["host"] == "target.example"
+    assert findings[1]["detail"]["matcher_name"] == "nginx"
+    assert findings[2]["detail"]["extracted_results"] == ["bare"]
+
+
+def test_nuclei_jsonl_findings_keep_template_details():
+    line = json.dumps({"template-id": "CVE-1", "info": {"name": "Bug", "severity": "critical", "tags": ["cve"]},
+                       "host": "https://x", "matched-at": "https://x/a", "type": "http"})
+    findings = hs.findings_from_parsed(parse("nuclei", line + "\n"))
+
+    assert findings == [{
+        "kind": "vulnerability", "host": "https://x", "name": "CVE-1", "severity": "critical",
+        "detail": {"name": "Bug", "type": "http", "matched_at": "https://x/a", "matcher_name": None,
+                   "extracted_results": [], "tags": ["cve"]}
+    }]
+
+
+def test_httpx_text_and_json_findings():
+    text = hs.findings_from_parsed(parse("httpx", "https://a.example [200] [Home]\nhttp://b.example:8080\n"))
+    assert [(f["host"], f["port"], f["state"]) for f in text] == [("a.example", 443, "200"), ("b.example", 8080, "None")]
+
+    line = json.dumps({"url": "https://c.example", "host": "1.2.3.4", "port": "8443", "status_code": 302})
+    json_finding = hs.findings_from_parsed(parse("httpx", line + "\n"))[0]
+    assert (json_finding["kind"], json_finding["port"], json_finding["name"]) == ("url", 8443, "https://c.example")
+
+
+def test_ffuf_text_findings_fall_back_to_the_fuzzed_word():
+    output = "admin                   [Status: 301, Size: 0, Words: 1, Lines: 1, Duration: 5ms]\n:: Progress: [10/10]\n"
+    findings = hs.findings_from_parsed(parse("ffuf", output))
+
+    assert [(f["kind"], f["name"], f["state"]) for f in findings] == [("path", "admin", "301")]
+    assert findings[0]["detail"]["length"] == 0
+
+
+# ---- filters ----
+
+def test_finding_filters_build_parameterised_clauses(store):
+    where, args = store._finding_filters({
+        "target": "10.0.0.1", "tool": "nmap", "kind": "port", "port": "22",
+        "severity": "High, critical", "since": "2026-01-01", "until": "1800000000"
+    })
+
+    assert where.startswith("WHERE ")
+    assert "(target = ? OR host = ?)" in where
+    assert "severity IN (?, ?)" in where
+    assert args[:3] == ["nmap", pytest.approx(time.mktime((2026, 1, 1, 0, 0, 0, 0, 0, -1))), 1800000000.0]
+    assert args[3:] == ["10.0.0.1", "10.0.0.1", "port", 22, "high", "critical"]
+
+
+def test_finding_filters_without_values_match_everything(store):
+    assert store._finding_filters({"target": None, "severity": ""}) == ("", [])
+
+
+@pytest.mark.parametrize("filters", [{"port": "abc"}, {"since": "garbage"}, {"scan_id": "x"}])
+def test_finding_filters_reject_bad_values(store, filters):
+    with pytest.raises(ValueError):
+        store._finding_filters(filters)
+
+
+# ---- store ----
+
+def ingest_samples(store):
+    nmap_id = store.ingest("nmap", "web.example", "/api/tools/nmap",
+                           {"stdout": NMAP_TEXT, "success": True, "return_code": 0}, observed_at=1000.0)
+    nuclei_id = store.ingest("nuclei", "https://target.example", "/api/tools/nuclei",
+                             {"stdout": NUCLEI_TEXT, "success": True, "return_code": 0}, observed_at=2000.0)
+    return nmap_id, nuclei_id
+
+
+def test_ingest_and_query_findings(store):
+    nmap_id, _ = ingest_samples(store)
+
+    findings, total = store.query_findings({}, limit=2, offset=0)
+    assert total == 8
+    assert [finding["tool"] for finding in findings] == ["nuclei", "nuclei"]
+
+    open_ports, total = store.query_findings({"target": "10.0.0.1", "kind": "port", "state": "open"}, 10, 0)
+    assert total == 2
+    assert {finding["port"] for finding in open_ports} == {22, 80}
+    assert all(finding["scan_id"] == nmap_id for finding in open_ports)
+
+    assert store.query_findings({"severity": "high,medium"}, 10, 0)[1] == 2
+    assert store.query_findings({"since": "1500"}, 10, 0)[1] == 3
+    assert store.query_findings({"until": "1500"}, 10, 0)[1] == 5
+
+
+def test_ingest_keeps_parsed_results_as_sent(store):
+    parsed = parse("nuclei", NUCLEI_TEXT)
+    scan_id = store.ingest("nuclei", "t", "/api/command", {"parsed": parsed, "stdout_bytes": 123})
+
+    scan = store.get_scan(scan_id, include_output=True)
+    assert scan["finding_count"] == 3
+    assert scan["output_bytes"] == 123
+    assert scan["output"] is None
+    assert scan["summary"]["by_severity"]["high"] == 1
+
+
+def test_iter_findings_pages_through_everything(store):
+    ingest_samples(store)
+
+    exported = list(store.iter_findings({}, batch=3))
+    assert len(exported) == 8
+    assert [finding["id"] for finding in exported] == sorted(finding["id"] for finding in exported)
+    assert len(list(store.iter_findings({"tool": "nuclei"}, batch=2))) == 3
+
+
+def test_iter_findings_validates_filters_before_iterating(store):
+    with pytest.raises(ValueError):
+        store.iter_findings({"port": "abc"})
+
+
+def test_scan_search_uses_fts_when_available(store):
+    if not store.fts_enabled:
+        pytest.skip("SQLite build without FTS5")
+    ingest_samples(store)
+
+    scans, total = store.query_scans({"q": "OpenSSH"}, 10, 0)
+    assert total == 1
+    assert scans[0]["tool"] == "nmap"
+    assert "[OpenSSH]" in scans[0]["match"]
+
+
+def test_scan_search_falls_back_to_like(plain_store):
+    assert plain_store.fts_enabled is False
+    ingest_samples(plain_store)
+
+    scans, total = plain_store.query_scans({"q": "git/config"}, 10, 0)
+    assert total == 1
+    assert scans[0]["tool"] == "nuclei"
+    assert "match" not in scans[0]
+    assert plain_store.query_scans({"q": "OpenSSH", "tool": "nuclei"}, 10, 0)[1] == 0
+
+
+def test_purge_removes_old_scans_and_their_search_rows(store):
+    ingest_samples(store)
+
+    assert store.purge(1500.0) == 1
+    assert store.query_findings({"tool": "nmap"}, 10, 0)[1] == 0
+    assert store.query_scans({"q": "OpenSSH"}, 10, 0)[1] == 0
+    assert store.get_stats()["scans"] == 1
+
+
+def test_submit_writes_on_the_background_thread(store):
+    store.submit("nuclei", "t", "/api/tools/nuclei", {"stdout": NUCLEI_TEXT, "success": True})
+    store.flush()
+
+    stats = store.get_stats()
+    assert stats["findings"] == 3
+    assert stats["ingest"]["ingested"] == 1
+    assert os.path.exists(store.path)
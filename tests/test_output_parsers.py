@@ -0,0 +1,162 @@
+import base64
+import json
+
+import hexstrike_server as hs
+
+NMAP_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap" args="nmap -sV -oX - 10.0.0.1">
+<host><status state="up" reason="syn-ack"/>
+<address addr="10.0.0.1" addrtype="ipv4"/>
+<address addr="00:11:22:33:44:55" addrtype="mac"/>
+<hostnames><hostname name="web.example" type="PTR"/></hostnames>
+<ports>
+<port protocol="tcp" portid="22"><state state="open"/><service name="ssh" product="OpenSSH" version="8.9"/></port>
+<port protocol="tcp" portid="80"><state state="open"/><service name="http" product="nginx"/>
+<script id="http-vuln-test" output="State: VULNERABLE"/></port>
+<port protocol="tcp" portid="443"><state state="closed"/></port>
+</ports>
+<os><osmatch name="Linux 5.x" accuracy="95"/></os>
+</host>
+<host><status state="down" reason="no-response"/><address addr="10.0.0.2" addrtype="ipv4"/></host>
+<runstats><finished elapsed="4.20" exit="success" summary="done"/></runstats>
+</nmaprun>
+"""
+
+
+def feed(parser, text):
+    for line in text.splitlines(keepends=True):
+        parser.feed(line)
+    parser.close()
+    return parser.to_dict()
+
+
+def test_nmap_xml_parser_builds_host_records():
+    parsed = feed(hs.NmapXMLParser(), NMAP_XML)
+
+    assert parsed["tool"] == "nmap"
+    assert parsed["record_count"] == 2
+    assert parsed["parse_errors"] == 0
+    host = parsed["records"][0]
+    assert host["address"] == "10.0.0.1"
+    assert host["mac"] == "00:11:22:33:44:55"
+    assert host["hostnames"] == ["web.example"]
+    assert host["os"] == "Linux 5.x"
+    assert [port["port"] for port in host["ports"]] == [22, 80, 443]
+    assert host["ports"][0]["product"] == "OpenSSH"
+    assert host["ports"][1]["scripts"] == [{"id": "http-vuln-test", "output": "State: VULNERABLE"}]
+    assert parsed["records"][1]["status"] == "down"
+
+    summary = parsed["summary"]
+    assert summary["hosts_up"] == 1
+    assert summary["open_ports"] == 2
+    assert summary["vulnerabilities"] == 1
+    assert summary["services"] == {"ssh": 1, "http": 1}
+    assert summary["run"]["elapsed"] == 4.2
+
+
+def test_nmap_xml_parser_keeps_hosts_from_truncated_output():
+    truncated = NMAP_XML[:NMAP_XML.index("<host><status state=\"down\"")]
+    parsed = feed(hs.NmapXMLParser(), truncated)
+
+    assert parsed["record_count"] == 1
+    assert parsed["parse_errors"] == 1
+
+
+def test_nmap_xml_parser_flags_non_xml_output():
+    parsed = feed(hs.NmapXMLParser(), "Starting Nmap 7.94\nNmap scan report for 10.0.0.1\n")
+
+    assert parsed["record_count"] == 0
+    assert parsed["parse_errors"] == 1
+
+
+def test_nmap_xml_parser_reset_discards_previous_attempt():
+    parser = hs.NmapXMLParser()
+    parser.feed(NMAP_XML)
+    parser.reset()
+    parsed = feed(parser, NMAP_XML)
+
+    assert parsed["record_count"] == 2
+
+
+def test_nuclei_jsonl_parser_normalizes_and_counts_severities():
+    lines = [
+        "[INF] Templates loaded for current scan: 2",
+        json.dumps({"template-id": "CVE-2021-41773", "info": {"name": "Apache traversal", "severity": "HIGH", "tags": ["cve"]},
+                    "type": "http", "host": "https://x", "matched-at": "https://x/cgi-bin", "timestamp": "t"}),
+        json.dumps({"template-id": "tech-detect", "info": {"severity": "info"}, "matcher-name": "nginx",
+                    "host": "https://x", "matched-at": "https://x"}),
+        "{not json",
+    ]
+    parsed = feed(hs.NucleiJSONLParser(), "\n".join(lines) + "\n")
+
+    assert parsed["record_count"] == 2
+    assert parsed["skipped_lines"] == 1
+    assert parsed["parse_errors"] == 1
+    first = parsed["records"][0]
+    assert first["template_id"] == "CVE-2021-41773"
+    assert first["severity"] == "high"
+    assert first["tags"] == ["cve"]
+    assert parsed["records"][1]["matcher_name"] == "nginx"
+    assert parsed["summary"] == {"findings": 2, "vulnerabilities": 1, "by_severity": {"high": 1, "info": 1}}
+
+
+def test_httpx_jsonl_parser_reads_both_key_styles():
+    lines = [
+        json.dumps({"url": "https://a.example", "host": "1.2.3.4", "port": "443", "status_code": 200,
+                    "title": "Home", "tech": ["Nginx"], "content_length": 10}),
+        json.dumps({"url": "http://b.example", "status-code": 404, "content-length": 5}),
+    ]
+    parsed = feed(hs.HttpxJSONLParser(), "\n".join(lines))
+
+    assert [record["status_code"] for record in parsed["records"]] == [200, 404]
+    assert parsed["records"][1]["content_length"] == 5
+    assert parsed["summary"]["technologies"] == {"Nginx": 1}
+    assert parsed["summary"]["urls"] == 2
+
+
+def test_ffuf_jsonl_parser_decodes_base64_inputs():
+    line = json.dumps({
+        "input": {"FUZZ": base64.b64encode(b"admin").decode(), "FFUFHASH": "abc"},
+        "url": "https://x/admin", "status": 301, "length": 0, "words": 1, "lines": 1,
+        "content-type": "text/html", "redirectlocation": "/admin/", "host": "x"
+    })
+    parsed = feed(hs.FfufJSONLParser(), line + "\n")
+
+    record = parsed["records"][0]
+    assert record["input"] == {"FUZZ": "admin"}
+    assert record["redirect"] == "/admin/"
+    assert parsed["summary"]["by_status"] == {"301": 1}
+
+
+def test_parser_truncates_records_past_the_limit():
+    lines = "".join(json.dumps({"url": f"https://{i}.example", "status_code": 200}) + "\n" for i in range(5))
+    parsed = feed(hs.HttpxJSONLParser(max_records=3), lines)
+
+    assert parsed["record_count"] == 5
+    assert len(parsed["records"]) == 3
+    assert parsed["truncated"] is True
+
+
+def test_structured_output_parses_cached_stdout_and_drops_raw():
+    result = {"stdout": NMAP_XML, "success": True}
+    with hs.StructuredOutput("nmap") as structured:
+        pass
+    attached = structured.attach(result, include_raw=False)
+
+    assert attached["parsed"]["record_count"] == 2
+    assert "stdout" not in attached
+    assert attached["stdout_bytes"] == len(NMAP_XML)
+    assert result["stdout"] == NMAP_XML
+
+
+def test_structured_output_is_a_no_op_when_disabled():
+    result = {"stdout": "x"}
+    with hs.StructuredOutput("nmap", enabled=False) as structured:
+        pass
+
+    assert structured.attach(result) is result
+
+
+def test_structured_output_args():
+    assert hs.structured_output_args("nmap") == ["-oX", "-"]
+    assert hs.structured_output_args("nuclei") == ["-jsonl"]